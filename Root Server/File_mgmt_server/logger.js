@@ -0,0 +1,73 @@
+import { createWriteStream, statSync } from "node:fs";
+import { rename } from "node:fs/promises";
+
+// JSON-lines logger writing through a buffered stream so tool calls never wait on disk.
+// LOG_FILE (default debug.log), LOG_LEVEL (debug|info|warn|error, default info),
+// LOG_SAMPLE_RATE (fraction of debug/info lines kept, default 1),
+// LOG_MAX_BYTES (rotation size, default 5 MB), LOG_MAX_FILES (rotated files kept, default 3).
+// Never log to stdout: it carries the MCP stdio protocol.
+
+const LEVELS = { debug: 10, info: 20, warn: 30, error: 40 };
+
+export function createLogger(name) {
+    const file = process.env.LOG_FILE || "debug.log";
+    const threshold = LEVELS[(process.env.LOG_LEVEL || "info").toLowerCase()] ?? LEVELS.info;
+    const sampleRate = Number(process.env.LOG_SAMPLE_RATE ?? 1);
+    const maxBytes = Number(process.env.LOG_MAX_BYTES || 5 * 1024 * 1024);
+    const maxFiles = Number(process.env.LOG_MAX_FILES || 3);
+
+    let stream = createWriteStream(file, { flags: "a" });
+    let size = 0;
+    try {
+        size = statSync(file).size;
+    } catch {
+        // New log file
+    }
+    let rotating = false;
+    let pending = [];
+
+    stream.on("error", () => {});
+
+    function rotate() {
+        rotating = true;
+        stream.end(async () => {
+            for (let i = maxFiles - 1; i >= 1; i--) {
+                await rename(`${file}.${i}`, `${file}.${i + 1}`).catch(() => {});
+            }
+            await rename(file, `${file}.1`).catch(() => {});
+            stream = createWriteStream(file, { flags: "a" });
+            stream.on("error", () => {});
+            size = 0;
+            rotating = false;
+            const queued = pending;
+            pending = [];
+            queued.forEach(write);
+        });
+    }
+
+    function write(line) {
+        if (rotating) {
+            pending.push(line);
+            return;
+        }
+        stream.write(line);
+        size += Buffer.byteLength(line);
+        if (size >= maxBytes) {
+            rotate();
+        }
+    }
+
+    function log(level, message, fields = {}) {
+        if (LEVELS[level] < threshold) return;
+        if (LEVELS[level] < LEVELS.warn && sampleRate < 1 && Math.random() >= sampleRate) return;
+        write(JSON.stringify({ ts: new Date().toISOString(), level, logger: name, msg: message, ...fields }) + "\n");
+    }
+
+    return {
+        debug: (message, fields) => log("debug", message, fields),
+        info: (message, fields) => log("info", message, fields),
+        warn: (message, fields) => log("warn", message, fields),
+        error: (message, fields) => log("error", message, fields),
+        isDebugEnabled: () => threshold <= LEVELS.debug,
+    };
+}
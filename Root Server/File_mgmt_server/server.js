@@ -3,10 +3,10 @@ import { StdioServerTransport } from "@modelcontextprotocol/sdk/server/stdio.js"
 import { exec as callbackExec } from "node:child_process";
 import { promisify } from "node:util";
 import { z } from "zod";
-import { writeFileSync, appendFileSync } from "node:fs";
+import { createLogger } from "./logger.js";
 
-// Clear the log file when server starts
-writeFileSync("debug.log", "=== Server Started ===\n");
+const logger = createLogger("file_management_mcp_server");
+logger.info("Server started");
 
 const server = new McpServer({
     name: "file_management_mcp_server",
@@ -26,26 +26,31 @@ server.tool(
         file_path: z.string().describe("The path of the file to read."),
     },
     async (input) => {
-        appendFileSync("debug.log", `DEBUG: read_file called with: ${input.file_path}\n`);
-        
         if (!input.file_path) {
-            appendFileSync("debug.log", "DEBUG: Missing file_path\n");
+            logger.warn("Missing file_path", { tool: "read_file" });
             return { content: [{ type: "text", text: "Missing file_path." }] };
         }
         
+        const started = performance.now();
         try {
             const command = `powershell.exe -ExecutionPolicy Bypass -File "C:\\Users\\jaymi\\OneDrive\\Documents\\Programs\\Projects\\Complete UI Automation\\Root Server\\File_mgmt_server\\tools\\read_file.ps1" -FilePath "${input.file_path}"`;
-            appendFileSync("debug.log", `DEBUG: Executing command: ${command}\n`);
+            logger.debug("Executing command", { tool: "read_file", command });
             
             const { stdout, stderr } = await exec(command);
-            appendFileSync("debug.log", `DEBUG: stdout: ${stdout}\n`);
-            appendFileSync("debug.log", `DEBUG: stderr: ${stderr}\n`);
+            if (stderr) {
+                logger.warn("PowerShell wrote to stderr", { tool: "read_file", stderr: stderr.slice(0, 500) });
+            }
             
             const response = JSON.parse(stdout.trim());
-            appendFileSync("debug.log", `DEBUG: Parsed response: ${JSON.stringify(response)}\n`);
+            logger.info("Tool completed", {
+                tool: "read_file",
+                file_path: input.file_path,
+                success: response.success,
+                stdout_bytes: stdout.length,
+                duration_ms: Math.round(performance.now() - started),
+            });
 
             if (!response.success) {
-                appendFileSync("debug.log", "DEBUG: Response not successful\n");
                 return {
                     content: [
                         { type: "text", text: `Error reading file:\n${response.message}` }
@@ -53,7 +58,6 @@ server.tool(
                 };
             }
 
-            appendFileSync("debug.log", "DEBUG: Returning success\n");
             return {
                 content: [
                     {
@@ -63,9 +67,13 @@ server.tool(
                 ],
             };
         } catch (error) {
-            appendFileSync("debug.log", `DEBUG: Caught error: ${error}\n`);
-            appendFileSync("debug.log", `DEBUG: Error message: ${error.message}\n`);
-            appendFileSync("debug.log", `DEBUG: Error stack: ${error.stack}\n`);
+            logger.error("Tool failed", {
+                tool: "read_file",
+                file_path: input.file_path,
+                error: error.message,
+                stack: error.stack,
+                duration_ms: Math.round(performance.now() - started),
+            });
             return {
                 content: [
                     {
@@ -80,18 +88,45 @@ server.tool(
 
 server.tool(
     "list_items",
-    "This tool lists all files and directories at the specified path. Provide the directory path as 'directory_path' to list its items.",
+    "This tool lists files and directories at the specified path. Provide the directory path as 'directory_path'. " +
+    "Results are paginated: pass the returned 'next_cursor' as 'cursor' to fetch the next page. " +
+    "Use 'name_filter', 'extensions', 'item_type' and 'sort_by' to narrow the listing, or 'summary' for counts and total size by extension.",
     {
         directory_path: z.string().describe("The path of the directory to list items from."),
+        page_size: z.number().int().min(1).max(1000).optional().describe("Maximum number of items to return (default 100)."),
+        cursor: z.number().int().min(0).optional().describe("Offset returned as 'next_cursor' by a previous call."),
+        name_filter: z.string().optional().describe("Wildcard pattern matched against item names, e.g. 'report*'."),
+        extensions: z.array(z.string()).optional().describe("Only include files with these extensions, e.g. ['mp4', 'mkv']."),
+        sort_by: z.enum(["name", "size", "modified", "extension"]).optional().describe("Sort key (default 'name')."),
+        descending: z.boolean().optional().describe("Sort in descending order."),
+        item_type: z.enum(["all", "files", "dirs"]).optional().describe("Restrict the listing to files or directories."),
+        summary: z.boolean().optional().describe("Return file/dir counts and total size per extension instead of items."),
     },
     async (input) => {
         if (!input.directory_path) {
             return { content: [{ type: "text", text: "Missing directory_path." }] };
         }
         try {
-            const command = `powershell.exe -ExecutionPolicy Bypass -File "C:\\Users\\jaymi\\OneDrive\\Documents\\Programs\\Projects\\Complete UI Automation\\Root Server\\File_mgmt_server\\tools\\list_items.ps1" -DirectoryPath "${input.directory_path}"`;
-            const result = await exec(command);
+            let command = `powershell.exe -ExecutionPolicy Bypass -File "C:\\Users\\jaymi\\OneDrive\\Documents\\Programs\\Projects\\Complete UI Automation\\Root Server\\File_mgmt_server\\tools\\list_items.ps1" -DirectoryPath "${input.directory_path}"`;
+            if (input.page_size !== undefined) command += ` -PageSize ${input.page_size}`;
+            if (input.cursor !== undefined) command += ` -Cursor ${input.cursor}`;
+            if (input.name_filter) command += ` -NameFilter "${input.name_filter.replace(/"/g, '')}"`;
+            if (input.extensions && input.extensions.length) command += ` -Extensions "${input.extensions.join(",").replace(/"/g, '')}"`;
+            if (input.sort_by) command += ` -SortBy ${input.sort_by}`;
+            if (input.descending) command += " -Descending";
+            if (input.item_type) command += ` -ItemType ${input.item_type}`;
+            if (input.summary) command += " -Summary";
+
+            const started = performance.now();
+            const result = await exec(command, { maxBuffer: 16 * 1024 * 1024 });
             const response = JSON.parse(result.stdout.trim());
+            logger.info("Tool completed", {
+                tool: "list_items",
+                directory_path: input.directory_path,
+                success: response.success,
+                stdout_bytes: result.stdout.length,
+                duration_ms: Math.round(performance.now() - started),
+            });
 
             if (!response.success) {
                 return {
@@ -110,6 +145,7 @@ server.tool(
                 ]
             }
         } catch (error) {
+            logger.error("Tool failed", { tool: "list_items", directory_path: input.directory_path, error: error.message });
             return {
                 content: [
                     {
@@ -135,8 +171,15 @@ server.tool(
         }
         try {
             const command = `powershell.exe -ExecutionPolicy Bypass -File "C:\\Users\\jaymi\\OneDrive\\Documents\\Programs\\Projects\\Complete UI Automation\\Root Server\\File_mgmt_server\\tools\\edit_file.ps1" -FilePath "${input.file_path}" -NewContent "${input.content.replace(/"/g, '\\"')}"`;
+            const started = performance.now();
             const result = await exec(command);
             const response = JSON.parse(result.stdout.trim());
+            logger.info("Tool completed", {
+                tool: "edit_file",
+                file_path: input.file_path,
+                success: response.success,
+                duration_ms: Math.round(performance.now() - started),
+            });
             if (!response.success) {
                 return {
                     content: [
@@ -154,6 +197,7 @@ server.tool(
                 ],
             };
         } catch (error) {
+            logger.error("Tool failed", { tool: "edit_file", file_path: input.file_path, error: error.message });
             return {
                 content: [
                     {
@@ -1,25 +1,94 @@
 param(
     [Parameter(Mandatory=$true)]
-    [string]$DirectoryPath
+    [string]$DirectoryPath,
+    [int]$PageSize = 100,
+    [int]$Cursor = 0,
+    [string]$NameFilter = "",
+    [string]$Extensions = "",
+    [ValidateSet("name", "size", "modified", "extension")]
+    [string]$SortBy = "name",
+    [switch]$Descending,
+    [ValidateSet("all", "files", "dirs")]
+    [string]$ItemType = "all",
+    [switch]$Summary
 )
 
 $result = @{
     success = $false
     data = $null
     message = ""
-}  
+}
 
 if (-Not (Test-Path $DirectoryPath)) {
     $result.message = "Directory not found: $DirectoryPath"
 }
 else {
     try {
-        $items = Get-ChildItem -Path $DirectoryPath -ErrorAction Stop | Select-Object Name, FullName, Length, LastWriteTime
-        $result.success = $true
-        $result.data = $items
+        # Let the provider apply the type and name filters. Sorting and counting still read every
+        # matching entry, so only a selective -NameFilter keeps very large folders cheap.
+        $query = @{ LiteralPath = $DirectoryPath; ErrorAction = "Stop" }
+        if ($ItemType -eq "files") { $query.File = $true }
+        elseif ($ItemType -eq "dirs") { $query.Directory = $true }
+        if ($NameFilter) { $query.Filter = $NameFilter }
+
+        $items = Get-ChildItem @query
+
+        if ($Extensions) {
+            $wanted = $Extensions.Split(",") | ForEach-Object { "." + $_.Trim().TrimStart(".").ToLower() } | Where-Object { $_ -ne "." }
+            # Directories have no extension to match, so keep them only when explicitly asked for
+            $items = $items | Where-Object {
+                if ($_.PSIsContainer) { $ItemType -eq "dirs" } else { $wanted -contains $_.Extension.ToLower() }
+            }
+        }
+
+        if ($Summary) {
+            $files = @($items | Where-Object { -not $_.PSIsContainer })
+            $byExtension = @{}
+            foreach ($group in ($files | Group-Object { if ($_.Extension) { $_.Extension.ToLower() } else { "(none)" } })) {
+                $byExtension[$group.Name] = @{
+                    count = $group.Count
+                    size = ($group.Group | Measure-Object -Property Length -Sum).Sum
+                }
+            }
+            $result.success = $true
+            $result.data = @{
+                mode = "summary"
+                files = $files.Count
+                dirs = @($items | Where-Object { $_.PSIsContainer }).Count
+                total_size = ($files | Measure-Object -Property Length -Sum).Sum
+                extensions = $byExtension
+            }
+        }
+        else {
+            $sortProperty = switch ($SortBy) {
+                "size" { "Length" }
+                "modified" { "LastWriteTime" }
+                "extension" { "Extension" }
+                default { "Name" }
+            }
+            $sorted = @($items | Sort-Object -Property $sortProperty -Descending:$Descending)
+            $page = @($sorted | Select-Object -Skip $Cursor -First $PageSize | ForEach-Object {
+                @{
+                    n = $_.Name
+                    d = [bool]$_.PSIsContainer
+                    s = if ($_.PSIsContainer) { $null } else { $_.Length }
+                    m = $_.LastWriteTime.ToString("yyyy-MM-dd HH:mm")
+                }
+            })
+            $next = $Cursor + $page.Count
+            $result.success = $true
+            $result.data = @{
+                mode = "page"
+                path = (Resolve-Path -LiteralPath $DirectoryPath).Path
+                total = $sorted.Count
+                cursor = $Cursor
+                next_cursor = if ($next -lt $sorted.Count) { $next } else { $null }
+                items = $page
+            }
+        }
     }
     catch {
         $result.message = "Error listing items: $_"
     }
 }
-$result | ConvertTo-Json -Compress
+$result | ConvertTo-Json -Compress -Depth 5
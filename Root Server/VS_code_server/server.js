@@ -4,6 +4,8 @@ import {exec as callbackExec} from "node:child_process";
 import {promisify} from "node:util";
 import {file, z} from "zod";
 import {writeFileSync, appendFileSync} from "node:fs";
+import {stat, readFile} from "node:fs/promises";
+import path from "node:path";
 
 const server = new McpServer({
     name: "vscode_mcp_server",
@@ -16,6 +18,76 @@ const server = new McpServer({
 
 const exec = promisify(callbackExec);
 
+const settingsPath = process.env.VSCODE_SETTINGS_PATH || path.join(process.env.APPDATA || "", "Code", "User", "settings.json");
+
+// Parsed settings.json, reused until the file's mtime changes
+const settingsCache = {mtimeMs: null, data: null};
+
+// settings.json is JSONC: drop comments and trailing commas while leaving string contents untouched.
+// Single pass; a trailing comma is remembered by its position so removing it is O(1).
+function parseJsonc(text) {
+    const output = [];
+    let inString = false;
+    let pendingComma = -1;
+    for (let i = 0; i < text.length; i++) {
+        const char = text[i];
+        if (inString) {
+            output.push(char);
+            if (char === "\\") {
+                output.push(text[++i] ?? "");
+            } else if (char === '"') {
+                inString = false;
+            }
+        } else if (char === "/" && text[i + 1] === "/") {
+            while (i < text.length && text[i] !== "\n") i++;
+            output.push("\n");
+        } else if (char === "/" && text[i + 1] === "*") {
+            i += 2;
+            while (i < text.length && !(text[i] === "*" && text[i + 1] === "/")) i++;
+            i++;
+        } else if (char === ",") {
+            pendingComma = output.length;
+            output.push(char);
+        } else if (char === "}" || char === "]") {
+            if (pendingComma !== -1) {
+                output[pendingComma] = "";
+                pendingComma = -1;
+            }
+            output.push(char);
+        } else {
+            if (!/\s/.test(char)) {
+                pendingComma = -1;
+                inString = char === '"';
+            }
+            output.push(char);
+        }
+    }
+    return JSON.parse(output.join("").replace(/^\uFEFF/, "").trim() || "{}");
+}
+
+async function loadSettings() {
+    const {mtimeMs} = await stat(settingsPath);
+    if (settingsCache.mtimeMs !== mtimeMs) {
+        settingsCache.data = parseJsonc(await readFile(settingsPath, "utf8"));
+        settingsCache.mtimeMs = mtimeMs;
+    }
+    return settingsCache.data;
+}
+
+// RFC 6901 JSON pointer lookup, e.g. "/[python]/editor.tabSize"
+function resolvePointer(data, pointer) {
+    if (pointer === "") return data;
+    let current = data;
+    for (const token of pointer.replace(/^\//, "").split("/")) {
+        const key = token.replace(/~1/g, "/").replace(/~0/g, "~");
+        if (current === null || typeof current !== "object" || !Object.hasOwn(current, key)) {
+            return undefined;
+        }
+        current = current[key];
+    }
+    return current;
+}
+
 server.tool(
     "open_file_in_vscode",
     "This tool opens a specified file in Visual Studio Code. Provide the file path as 'file_path' to open it.(if path does not exists, it will be created)",
@@ -55,27 +127,47 @@ server.tool(
 
 server.tool(
     "get_settings",
-    "This tool retrieves the current VS Code settings as a JSON object.",
-    async () => {
+    "This tool retrieves VS Code user settings. Provide 'key' (e.g. 'editor.fontSize') for a single setting, " +
+    "'pointer' for a JSON pointer into the settings (e.g. '/[python]/editor.tabSize'), or 'prefix' (e.g. 'editor.') " +
+    "to get all settings whose key starts with it. With no arguments the full settings object is returned.",
+    {
+        key: z.string().optional().describe("Exact setting key to retrieve."),
+        pointer: z.string().optional().describe("JSON pointer to a value inside the settings object."),
+        prefix: z.string().optional().describe("Return every setting whose key starts with this prefix."),
+    },
+    async ({key, pointer, prefix}) => {
         try {
-            const command = `powershell.exe -ExecutionPolicy Bypass -File "C:\\Users\\jaymi\\OneDrive\\Documents\\Programs\\Projects\\Complete UI Automation\\Root Server\\VS_code_server\\tools\\fetch_settings.ps1"`;
-            const {stdout, stderr} = await exec(command);
-            const response = JSON.parse(stdout.trim());
-
-            if (!response.success) {
-                return {
-                    content: [
-                        {type: "text", text: `Error retrieving VS Code settings:\n${response.message}`},
-                    ],
-                };
+            const settings = await loadSettings();
+            let result;
+            if (key) {
+                if (!Object.hasOwn(settings, key)) {
+                    return {content: [{type: "text", text: `Setting '${key}' is not set in VS Code user settings.`}]};
+                }
+                result = {[key]: settings[key]};
+            } else if (pointer !== undefined) {
+                const value = resolvePointer(settings, pointer);
+                if (value === undefined) {
+                    return {content: [{type: "text", text: `Nothing found at '${pointer}' in VS Code user settings.`}]};
+                }
+                result = {[pointer]: value};
+            } else if (prefix) {
+                result = Object.fromEntries(Object.entries(settings).filter(([name]) => name.startsWith(prefix)));
+                if (Object.keys(result).length === 0) {
+                    return {content: [{type: "text", text: `No VS Code settings start with '${prefix}'.`}]};
+                }
+            } else {
+                result = settings;
             }
             return {
                 content: [
-                    {type: "text", text: `VS Code settings retrieved successfully:\n${JSON.stringify(response.data)}`},
+                    {type: "text", text: `VS Code settings retrieved successfully:\n${JSON.stringify(result)}`},
                 ],
             };
         } catch (error) {
-            return {content: [{type: "text", text: `Error executing VS Code command: ${error.message}`}]};
+            if (error.code === "ENOENT") {
+                return {content: [{type: "text", text: `Error retrieving VS Code settings:\nsettings.json not found at ${settingsPath}`}]};
+            }
+            return {content: [{type: "text", text: `Error retrieving VS Code settings: ${error.message}`}]};
         }
     }
 )
@@ -0,0 +1,279 @@
+"""
+Local catalog of launchable applications with fuzzy name resolution
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from collections import defaultdict
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LAUNCHABLE_EXTENSIONS = {".lnk", ".exe", ".url", ".appref-ms", ".desktop"}
+REFRESH_INTERVAL_SECONDS = 60
+MIN_SCORE = 0.3
+
+
+def default_directories():
+    """Directories scanned when APP_CATALOG_DIRS is not configured"""
+    if os.name == "nt":
+        candidates = [
+            os.path.join(os.getenv("ProgramData", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
+            os.path.join(os.getenv("APPDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
+            os.path.join(os.getenv("USERPROFILE", ""), "Desktop"),
+            os.path.join(os.getenv("PUBLIC", ""), "Desktop"),
+        ]
+    else:
+        candidates = [
+            "/usr/share/applications",
+            "/usr/local/share/applications",
+            os.path.expanduser("~/.local/share/applications"),
+        ]
+    return [path for path in candidates if os.path.isdir(path)]
+
+
+def configured_directories():
+    configured = os.getenv("APP_CATALOG_DIRS")
+    if configured:
+        return [path for path in configured.split(os.pathsep) if path]
+    return default_directories()
+
+
+def normalize(name):
+    """
+    Lowercase and strip punctuation so 'MS-Word (64 bit)' matches 'ms word 64 bit'.
+    '+' and '#' are kept so 'Notepad++' and 'Notepad' stay distinct.
+    """
+    return " ".join(re.sub(r"[^a-z0-9+#]+", " ", name.lower()).split())
+
+
+def trigrams(name):
+    padded = f"  {normalize(name)} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def parse_desktop_entry(path):
+    """Read the display name of a freedesktop .desktop file, None if it is hidden"""
+    name = None
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as desktop_file:
+            in_entry = False
+            for line in desktop_file:
+                line = line.strip()
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and line.startswith("Name=") and name is None:
+                    name = line[len("Name="):]
+                elif in_entry and line in ("NoDisplay=true", "Hidden=true"):
+                    return None
+    except OSError:
+        return None
+    return name
+
+
+class ApplicationCatalog:
+    def __init__(self, directories=None, cache_path=None):
+        self.directories = directories if directories is not None else configured_directories()
+        self.cache_path = cache_path or os.getenv(
+            "APP_CATALOG_PATH",
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_catalog.json"),
+        )
+        # directory -> {"mtime": float, "subdirs": [...], "apps": [{"name", "path"}]}
+        self.scanned = {}
+        # (entries, trigram -> entry positions), replaced as a whole so readers always see a complete index
+        self.indexed = ([], {})
+        self.last_refresh = 0.0
+        # resolve() runs on worker threads; only one of them may walk and rebuild the index
+        self.refresh_lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Load the on-disk cache so startup does not require a full scan"""
+        try:
+            with open(self.cache_path, encoding="utf-8") as cache_file:
+                self.scanned = json.load(cache_file).get("directories", {})
+        except (OSError, ValueError):
+            self.scanned = {}
+
+    def save(self):
+        """Write the cache atomically; several server workers may save it at the same time"""
+        try:
+            descriptor, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.cache_path)), suffix=".tmp"
+            )
+            try:
+                with os.fdopen(descriptor, "w", encoding="utf-8") as cache_file:
+                    json.dump({"directories": self.scanned}, cache_file)
+                os.replace(temp_path, self.cache_path)
+            except OSError:
+                os.remove(temp_path)
+                raise
+        except OSError:
+            pass
+
+    def scan_directory(self, directory):
+        """List launchable entries and subdirectories of a single directory"""
+        apps, subdirs = [], []
+        try:
+            with os.scandir(directory) as listing:
+                for entry in listing:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    stem, extension = os.path.splitext(entry.name)
+                    if extension.lower() not in LAUNCHABLE_EXTENSIONS:
+                        continue
+                    name = stem
+                    if extension.lower() == ".desktop":
+                        name = parse_desktop_entry(entry.path)
+                        if not name:
+                            continue
+                    if "uninstall" in name.lower():
+                        continue
+                    apps.append({"name": name, "path": entry.path})
+        except OSError:
+            pass
+        return apps, subdirs
+
+    def refresh(self, force=False):
+        """
+        Walk the configured directories, rescanning only those whose mtime changed.
+        Adding or removing a shortcut updates its parent directory's mtime, so
+        unchanged trees cost a single stat per directory.
+        """
+        with self.refresh_lock:
+            if not force and time.time() - self.last_refresh < REFRESH_INTERVAL_SECONDS:
+                return
+            self.walk(force)
+
+    def walk(self, force):
+        scanned, changed = {}, False
+        pending = list(self.directories)
+        while pending:
+            directory = pending.pop()
+            if directory in scanned:
+                continue
+            try:
+                mtime = os.stat(directory).st_mtime
+            except OSError:
+                changed = changed or directory in self.scanned
+                continue
+
+            cached = self.scanned.get(directory)
+            if force or not cached or cached.get("mtime") != mtime:
+                apps, subdirs = self.scan_directory(directory)
+                cached = {"mtime": mtime, "subdirs": subdirs, "apps": apps}
+                changed = True
+            scanned[directory] = cached
+            pending.extend(cached["subdirs"])
+
+        changed = changed or scanned.keys() != self.scanned.keys()
+        self.scanned = scanned
+        if changed or not self.indexed[0]:
+            self.build_index()
+        if changed:
+            self.save()
+        self.last_refresh = time.time()
+
+    def build_index(self):
+        entries, index, seen = [], defaultdict(set), set()
+        for directory in sorted(self.scanned):
+            for app in self.scanned[directory]["apps"]:
+                # The same shortcut often exists in the Start Menu and on the Desktop; keep one
+                key = normalize(app["name"])
+                if key in seen:
+                    continue
+                seen.add(key)
+                position = len(entries)
+                entries.append(app)
+                for gram in trigrams(app["name"]):
+                    index[gram].add(position)
+        self.indexed = (entries, dict(index))
+
+    def resolve(self, query, limit=5):
+        """Return the best matching applications for a free-form name, best first"""
+        self.refresh()
+        entries, index = self.indexed
+        wanted = normalize(query)
+        if not wanted:
+            return []
+
+        query_grams = trigrams(query)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for position in index.get(gram, ()):
+                shared[position] += 1
+        # Acronyms ('gimp', 'vlc') share few trigrams with the full name, so consider every entry for them
+        if len(wanted) <= 5 and " " not in wanted:
+            for position in range(len(entries)):
+                shared.setdefault(position, 0)
+
+        matches = []
+        for position, common in shared.items():
+            entry = entries[position]
+            name = normalize(entry["name"])
+            words = name.split()
+            # The last non-numeric word is usually the product ('Microsoft Word', 'Office 2016 Excel')
+            significant = [word for word in words if not word.isdigit()] or words
+            # Dice coefficient over trigrams, boosted for exact and substring hits
+            similarity = 2 * common / (len(query_grams) + len(trigrams(entry["name"])))
+            score = similarity
+            if name == wanted:
+                score = 1.0
+            elif wanted == significant[-1] or name.endswith(" " + wanted):
+                score = max(score, 0.95)
+            elif wanted in words:
+                score = max(score, 0.9)
+            elif name.startswith(wanted):
+                score = max(score, 0.85)
+            elif wanted in name:
+                score = max(score, 0.75)
+            elif wanted == "".join(word[0] for word in name.split()):
+                score = max(score, 0.8)
+            if score >= MIN_SCORE:
+                matches.append((score, similarity, {"name": entry["name"], "path": entry["path"], "score": round(score, 3)}))
+
+        # Equal boosts are decided by overall trigram similarity, not by name length
+        matches.sort(key=lambda match: (-match[0], -match[1], match[2]["name"]))
+        return [match for _, _, match in matches[:limit]]
+
+
+catalog = None
+catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    global catalog
+    with catalog_lock:
+        if catalog is None:
+            catalog = ApplicationCatalog()
+    return catalog
+
+
+async def warm_catalog():
+    """Load and refresh the catalog off the event loop, e.g. at server startup"""
+    await asyncio.to_thread(lambda: get_catalog().refresh())
+
+
+async def resolve_application(name: str) -> dict:
+    """
+    Resolve an application name (possibly misspelled or informal, e.g. 'word', 'chrome', 'notepad++')
+    to installed launchable applications. Returns the best match and other candidates with their paths.
+    """
+    # A cold or stale catalog walks the Start Menu/Desktop trees; keep that off the event loop
+    matches = await asyncio.to_thread(lambda: get_catalog().resolve(name))
+    if not matches:
+        return {
+            "status": "not_found",
+            "message": f"No installed application matches '{name}'.",
+        }
+    return {
+        "status": "success",
+        "best_match": matches[0],
+        "candidates": matches[1:],
+    }
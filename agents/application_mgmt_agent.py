@@ -9,6 +9,7 @@ from google.adk.tools.tool_context import ToolContext
 from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
 from mcp import StdioServerParameters
+from app_catalog import resolve_application
 
 # TODO: Agent is not exitting the loop on success, fix that.
 # TODO: Add this file to github repo.
@@ -40,9 +41,11 @@ starter_agent = Agent(
     instruction=(
         "You are an automation starter agent. "
         "Your task is to use the open_software tool from automation_toolset to open software. "
-        'You must call the tool with JSON: {"name": "software name"}'
+        "First call the resolve_application tool with the software name the user mentioned to find the installed application. "
+        "If it returns a best_match, open that application using its path. "
+        'You must call the tool with JSON: {"name": "resolved path or software name"}'
     ),
-    tools=[automation_toolset],
+    tools=[FunctionTool(resolve_application), automation_toolset],
     output_key="response",
 )
 
@@ -62,18 +65,19 @@ retry_agent = Agent(
     model=Gemini(model="gemini-2.5-flash-lite"),
     instruction=(
         "If checker_response is SUCCESS, **you MUST call the 'exit_loop' function and do nothing else.** "
-        "If checker_response starts with FAILURE, extract a better possible name and "
-        "retry using the open_software tool again. "
-        'You must always call open_software tool using JSON: {"name": "corrected name"}'
+        "If checker_response starts with FAILURE, do not guess a new name: "
+        "retry using the open_software tool with the path of the next candidate returned by resolve_application. "
+        "Only call resolve_application again if no candidates are left. "
+        'You must always call open_software tool using JSON: {"name": "candidate path"}'
     ),
-    tools=[automation_toolset, FunctionTool(exit_loop)],
+    tools=[automation_toolset, FunctionTool(resolve_application), FunctionTool(exit_loop)],
     output_key="response",
 )
 
 loop_agent = LoopAgent(
     name="automation_loop_agent",
     sub_agents=[checker_agent, retry_agent],
-    max_iterations=5,
+    max_iterations=3,
 )
 
 software_mgmt_agent = SequentialAgent(
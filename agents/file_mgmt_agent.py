@@ -9,6 +9,8 @@ from google.adk.tools.tool_context import ToolContext
 from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
 from mcp import StdioServerParameters
+from listing import compact_listing_callback
+from session_lock import worker_slot
 
 load_dotenv()
 
@@ -19,6 +21,13 @@ os.environ["GOOGLE_API_KEY"] = os.getenv("GOOGLE_API_KEY")
 #     tool_context.actions.escalate = True
 #     return {"status": "exit", "message": "Operation completed successfully. Exiting loop."}
 
+# Every server worker spawns its own file server; with several workers each one logs to
+# debug.<worker slot>.log so their size counters and rotations do not fight over one file
+file_server_env = None
+if int(os.getenv("JARVIS_WORKERS", "1")) > 1:
+    log_file = os.getenv("FILE_SERVER_LOG_FILE", "debug.{worker}.log").replace("{worker}", str(worker_slot()))
+    file_server_env = {**os.environ, "LOG_FILE": log_file}
+
 file_management_toolset = McpToolset(
     connection_params=StdioConnectionParams(
         server_params=StdioServerParameters(
@@ -26,6 +35,7 @@ file_management_toolset = McpToolset(
             args=[
                 "C:\\Users\\jaymi\\OneDrive\\Documents\\Programs\\Projects\\Complete UI Automation\\Root Server\\File_mgmt_server\\server.js"
             ],
+            env=file_server_env,
         )
     )
 )
@@ -40,13 +50,18 @@ starter_file_management_agent = Agent(
         "READING FILES: Use the read_file tool with the exact file path. Return the file content exactly as retrieved. "
         "FORMAT: 'File content:\n[exact file content]' "
         "\n"
-        "LISTING DIRECTORIES: Use the list_items tool to show all files and folders in a directory. "
+        "LISTING DIRECTORIES: Use the list_items tool to show files and folders in a directory. "
+        "Only ask for what the user needs: use 'extensions' or 'name_filter' to filter by type or name, "
+        "'item_type' for files-only or dirs-only, 'sort_by'/'descending' for ordering and 'page_size' to limit results. "
+        "Use 'summary' when the user wants counts or sizes rather than individual items. "
+        "If the result reports a next_cursor and more items are needed, call list_items again with 'cursor' set to it. "
         "FORMAT: 'Directory contents:\n[list of items]' "
         "\n"
         "EDITING/APPENDING FILES: Use the edit_file tool to modify or append content to files. "
         "FORMAT: 'File updated successfully. Path: [path], Content appended: [what was added]' "
         "\n"
         "SEARCHING IN SUBDIRECTORIES: If a file is not found in the initial directory, use list_items to explore subdirectories. "
+        "Use item_type 'dirs' to list only subdirectories. "
         "Track which subdirectories you've searched and report them. "
         "\n"
         "ERROR HANDLING: If an operation fails, clearly state the error and the path/file you were trying to access. "
@@ -55,6 +70,7 @@ starter_file_management_agent = Agent(
         "CRITICAL: Always return raw content without interpretation or summarization."
     ),
     tools=[file_management_toolset],
+    after_tool_callback=compact_listing_callback,
     output_key="response",
 )
 
@@ -117,6 +133,7 @@ retry_agent = Agent(
     ),
     output_key="response",
     tools=[FunctionTool(exit_loop), file_management_toolset],
+    after_tool_callback=compact_listing_callback,
 )
 
 loop_agent = LoopAgent(
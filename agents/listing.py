@@ -0,0 +1,75 @@
+"""
+Compact rendering of list_items results before they reach the model
+"""
+
+import json
+
+
+def format_size(size):
+    """Render a byte count the way a file explorer would"""
+    if size is None:
+        return ""
+    size = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def compact_listing(data):
+    """Turn the JSON payload of list_items into a short line-per-item text block"""
+    if data.get("mode") == "summary":
+        lines = [
+            f"Files: {data.get('files', 0)}, Directories: {data.get('dirs', 0)}, "
+            f"Total size: {format_size(data.get('total_size') or 0)}"
+        ]
+        extensions = sorted(
+            (data.get("extensions") or {}).items(),
+            key=lambda entry: entry[1].get("size") or 0,
+            reverse=True,
+        )
+        for extension, stats in extensions:
+            lines.append(
+                f"  {extension}: {stats.get('count', 0)} files, {format_size(stats.get('size') or 0)}"
+            )
+        return "\n".join(lines)
+
+    items = data.get("items") or []
+    cursor = data.get("cursor") or 0
+    header = f"{data.get('path', '')} ({len(items)} of {data.get('total', len(items))} items"
+    if items:
+        header += f", showing {cursor + 1}-{cursor + len(items)}"
+    if data.get("next_cursor") is not None:
+        header += f", next_cursor={data['next_cursor']}"
+    header += ")"
+
+    lines = [header]
+    for item in items:
+        if item.get("d"):
+            lines.append(f"[DIR] {item.get('n')}/  {item.get('m', '')}")
+        else:
+            lines.append(f"{item.get('n')}  {format_size(item.get('s'))}  {item.get('m', '')}")
+    return "\n".join(lines)
+
+
+def compact_listing_callback(tool, args, tool_context, tool_response):
+    """after_tool_callback that replaces raw list_items JSON with its compact form"""
+    if tool.name != "list_items" or not isinstance(tool_response, dict):
+        return None
+
+    content = tool_response.get("content") or []
+    if not content or content[0].get("type") != "text":
+        return None
+
+    try:
+        data = json.loads(content[0]["text"])
+    except (json.JSONDecodeError, TypeError):
+        # Error messages from the server are already plain text
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    compacted = dict(tool_response)
+    compacted["content"] = [{"type": "text", "text": compact_listing(data)}]
+    return compacted
@@ -0,0 +1,124 @@
+"""
+Structured JSON-lines logging that writes through a background queue
+"""
+
+import os
+import copy
+import json
+import atexit
+import random
+import logging
+import logging.handlers
+import queue
+from datetime import datetime, timezone
+from contextvars import ContextVar
+from session_lock import worker_slot
+
+# Set once per request so every record logged while handling it carries the id
+request_id_var = ContextVar("request_id", default=None)
+
+STRUCTURED_FIELDS = ("request_id", "agent", "event_type", "duration_ms")
+
+listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            # UTC, same format as the Node servers' new Date().toISOString()
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # The record is formatted on the listener thread, so resolve everything
+        # that depends on the caller (message args, traceback, request id) here.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of DEBUG/INFO records; warnings and errors are never dropped"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or self.rate >= 1 or random.random() < self.rate
+
+
+def configure_logging():
+    """
+    Route the 'jarvis' logger through a QueueHandler so callers only enqueue records;
+    formatting and file I/O happen on the QueueListener thread.
+
+    JARVIS_LOG_LEVEL        minimum level (default INFO)
+    JARVIS_LOG_SAMPLE_RATE  fraction of records below WARNING to keep (default 1.0)
+    JARVIS_LOG_FILE         log file path; '{worker}' is replaced by the worker slot. Defaults to
+                            jarvis.log, or jarvis.{worker}.log when JARVIS_WORKERS > 1 so that
+                            workers never rotate the same file
+    JARVIS_LOG_MAX_BYTES    rotate when the file exceeds this size (default 10 MB)
+    JARVIS_LOG_BACKUPS      number of rotated files to keep (default 5)
+    JARVIS_LOG_CONSOLE      also write JSON lines to stderr when set to 1
+    """
+    global listener
+    if listener is not None:
+        return
+
+    logger = logging.getLogger("jarvis")
+
+    logger.setLevel(os.getenv("JARVIS_LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
+
+    formatter = JsonFormatter()
+    log_file = os.getenv("JARVIS_LOG_FILE", "jarvis.{worker}.log" if int(os.getenv("JARVIS_WORKERS", "1")) > 1 else "jarvis.log")
+    if "{worker}" in log_file:
+        log_file = log_file.replace("{worker}", str(worker_slot()))
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file,
+        maxBytes=int(os.getenv("JARVIS_LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+        backupCount=int(os.getenv("JARVIS_LOG_BACKUPS", "5")),
+        encoding="utf-8",
+    )
+    file_handler.setFormatter(formatter)
+    handlers = [file_handler]
+    if os.getenv("JARVIS_LOG_CONSOLE") == "1":
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(float(os.getenv("JARVIS_LOG_SAMPLE_RATE", "1.0"))))
+    logger.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(listener.stop)
+
+
+def get_logger(name):
+    configure_logging()
+    return logging.getLogger(f"jarvis.{name}")
@@ -5,9 +5,13 @@ Main agent module with rate limit handling and optimizations
 import os
 import asyncio
 import time
+import logging
 from dotenv import load_dotenv
-from file_mgmt_agent import file_management_agent
-from vs_code_agent import vs_code_agent
+from file_mgmt_agent import file_management_agent, file_management_toolset
+from vs_code_agent import vs_code_agent, vs_code_toolset
+from application_mgmt_agent import software_mgmt_agent, automation_toolset
+from app_catalog import warm_catalog
+from log_config import get_logger
 
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
@@ -18,6 +22,7 @@ from google.adk.apps.app import App
 from google.genai.errors import ClientError
 
 load_dotenv()
+logger = get_logger("main_agent")
 api_key = os.getenv("GOOGLE_API_KEY")
 if api_key:
     print("GOOGLE_API_KEY found and set: ", api_key[:4] + "...")
@@ -46,18 +51,23 @@ main_agent = Agent(
     2. VS Code Automation (via vs_code_agent):
     - OPEN FOLDER: Open a folder in Visual Studio Code.
     - OPEN FILE: Open a file in VS Code; if the file does not exist, create it.
-    - GET SETTINGS: Retrieve current VS Code user settings as a JSON object.
+    - GET SETTINGS: Retrieve VS Code user settings, either specific keys, a key prefix or the full JSON object.
+
+    3. Application Management (via software_mgmt_agent):
+    - OPEN APPLICATION: Launch an installed application by name (e.g. "open chrome", "start notepad").
+      Informal or misspelled names are resolved against the installed application catalog.
 
     =====================
     HOW TO HANDLE USER REQUESTS
     =====================
     1. GREET FRIENDLY: Always start interactions in a polite, approachable way.
     2. UNDERSTAND USER INTENT:
-    - Identify what the user wants to do: file management or VS Code automation.
+    - Identify what the user wants to do: file management, VS Code automation or opening an application.
     - Determine necessary paths and filenames.
     3. PLAN AND EXECUTE:
     - For file management tasks, delegate to file_management_agent.
     - For VS Code tasks, delegate to vs_code_agent.
+    - For launching applications, delegate to software_mgmt_agent.
     - Always validate that paths exist or create files/folders as needed.
     4. RESPOND CLEARLY:
     - Explain what you did and confirm successful completion.
@@ -79,13 +89,50 @@ main_agent = Agent(
     tools=[
         AgentTool(agent=file_management_agent),
         AgentTool(agent=vs_code_agent),
+        AgentTool(agent=software_mgmt_agent),
     ],
 )
 
 app = App(name="jarvis_app", root_agent=main_agent)
-session_service = InMemorySessionService()
+
+# Sessions must live in a shared store when the server runs with several workers,
+# otherwise a follow-up request landing on another worker would not find its session.
+# server.py sets this automatically for JARVIS_WORKERS > 1; when starting uvicorn/gunicorn
+# with several workers directly, set e.g. JARVIS_SESSION_DB_URL=sqlite+aiosqlite:///./jarvis_sessions.db
+# and JARVIS_WORKERS=N, which also gives every worker and its file server their own log files, e.g.
+#   JARVIS_WORKERS=4 JARVIS_SESSION_DB_URL=... uvicorn server:app --workers 4
+#   JARVIS_WORKERS=4 JARVIS_SESSION_DB_URL=... gunicorn server:app -k uvicorn.workers.UvicornWorker -w 4
+session_db_url = os.getenv("JARVIS_SESSION_DB_URL")
+if session_db_url:
+    # Needs the optional SQLAlchemy dependency, so only import it when a shared store is configured
+    from google.adk.sessions import DatabaseSessionService
+
+    engine_options = {}
+    if session_db_url.startswith("sqlite"):
+        # Workers write to one SQLite file; wait for the write lock instead of failing after 5 s
+        engine_options["connect_args"] = {"timeout": 30}
+    session_service = DatabaseSessionService(db_url=session_db_url, **engine_options)
+else:
+    if int(os.getenv("JARVIS_WORKERS", "1")) > 1:
+        logger.warning(
+            "JARVIS_WORKERS > 1 but JARVIS_SESSION_DB_URL is not set: every worker keeps its own "
+            "in-memory sessions and follow-up requests on another worker will not find theirs."
+        )
+    session_service = InMemorySessionService()
 jarvis_runner = Runner(session_service=session_service, app=app)
 
+# MCP servers are spawned per process, so every worker owns its own tool-server pool
+toolsets = [file_management_toolset, vs_code_toolset, automation_toolset]
+
+
+async def close_toolsets():
+    """Shut down this process's MCP tool servers"""
+    for toolset in toolsets:
+        try:
+            await toolset.close()
+        except Exception as e:
+            logger.warning(f"Failed to close toolset: {e}")
+
 
 # Track API calls for rate limiting
 class RateLimitTracker:
@@ -164,15 +211,15 @@ async def run_with_rate_limit_handling():
 
             # Collect ALL text parts from all model responses
             if event.content and event.content.parts:
-                print(
-                    f"[DEBUG] Processing model response with {len(event.content.parts)} parts."
-                )
                 for part in event.content.parts:
                     if hasattr(part, "text") and part.text:
                         all_text_responses.append(part.text)
-                        print(f"[DEBUG] Captured text: {part.text[:100]}...")
-                    elif hasattr(part, "function_call"):
-                        print(f"[TOOL CALL] {part.function_call}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    for call in event.get_function_calls():
+                        logger.debug(
+                            f"Tool call: {call.name}",
+                            extra={"agent": event.author, "event_type": "function_call"},
+                        )
 
     except ClientError as e:
         error_str = str(e)
@@ -193,15 +240,11 @@ async def run_with_rate_limit_handling():
             print("\nCurrent time: Next request available in ~65 seconds")
         else:
             print(f"\nERROR: {error_str}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("Client error during agent run", extra={"event_type": "run_error"})
 
     except Exception as e:
         print(f"An error occurred during the agent run: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Exception during agent run", extra={"event_type": "run_error"})
 
     # Print the final response
     print("\n" + "=" * 50)
@@ -215,24 +258,15 @@ async def run_with_rate_limit_handling():
     else:
         print("No response generated")
         print("=" * 50 + "\n")
-        if events:
-            print("Debug - All events and their parts:")
-            for i, event in enumerate(events):
-                print(f"\nEvent {i}:")
-                print(f"  Author: {event.author}")
-                print(f"  Role: {event.content.role if event.content else 'None'}")
-                if event.content and event.content.parts:
-                    for j, part in enumerate(event.content.parts):
-                        part_type = type(part).__name__
-                        print(f"  Part {j}: {part_type}")
-                        if hasattr(part, "text"):
-                            print(
-                                f"    Text: {part.text[:150] if part.text else 'None'}..."
-                            )
-                        if hasattr(part, "tool_call"):
-                            print(f"    Tool call: {part.tool_call}")
-                else:
-                    print(f"  No parts in this event")
+        if events and logger.isEnabledFor(logging.DEBUG):
+            for event in events:
+                parts = event.content.parts if event.content and event.content.parts else []
+                logger.debug(
+                    f"role={event.content.role if event.content else None} "
+                    f"parts={[type(part).__name__ for part in parts]} "
+                    f"text={[part.text[:150] for part in parts if getattr(part, 'text', None)]}",
+                    extra={"agent": event.author, "event_type": "response_analysis"},
+                )
 
     print("\n" + "=" * 50 + "\n")
 
@@ -0,0 +1,110 @@
+"""
+Per-session locking shared by every server worker process
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import tempfile
+from contextlib import asynccontextmanager
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+LOCK_DIR = os.getenv("JARVIS_LOCK_DIR", os.path.join(tempfile.gettempdir(), "jarvis_session_locks"))
+POLL_SECONDS = 0.05
+
+# Requests for the same session inside one worker queue here instead of polling the lock file
+local_locks = {}
+
+worker_slot_index = None
+
+
+def lock_path(session_id):
+    digest = hashlib.sha1(session_id.encode("utf-8")).hexdigest()
+    return os.path.join(LOCK_DIR, f"{digest}.lock")
+
+
+def try_lock(descriptor):
+    """Take an exclusive advisory lock without blocking; False if another process holds it"""
+    try:
+        if os.name == "nt":
+            os.lseek(descriptor, 0, os.SEEK_SET)
+            msvcrt.locking(descriptor, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def unlock(descriptor):
+    if os.name == "nt":
+        os.lseek(descriptor, 0, os.SEEK_SET)
+        msvcrt.locking(descriptor, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(descriptor, fcntl.LOCK_UN)
+
+
+@asynccontextmanager
+async def session_lock(session_id, timeout=300):
+    """
+    Serialize agent runs for one session across all worker processes.
+    The lock is an OS advisory lock (flock / msvcrt.locking) on a per-session
+    file, so the kernel releases it if the holding worker crashes and a busy
+    event loop cannot cause it to expire. Lock files are never deleted, which
+    keeps every process locking the same inode.
+    """
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    entry = local_locks.setdefault(session_id, {"lock": asyncio.Lock(), "users": 0})
+    entry["users"] += 1
+    try:
+        # The timeout covers waiting behind requests in this worker as well as in other workers
+        try:
+            await asyncio.wait_for(entry["lock"].acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Session {session_id} is busy in this worker.") from None
+        try:
+            descriptor = os.open(lock_path(session_id), os.O_CREAT | os.O_RDWR)
+            try:
+                while not try_lock(descriptor):
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Session {session_id} is busy in another worker.")
+                    await asyncio.sleep(POLL_SECONDS)
+                try:
+                    yield
+                finally:
+                    unlock(descriptor)
+            finally:
+                os.close(descriptor)
+        finally:
+            entry["lock"].release()
+    finally:
+        entry["users"] -= 1
+        if entry["users"] == 0:
+            local_locks.pop(session_id, None)
+
+
+def worker_slot():
+    """
+    Stable index (0, 1, ...) of this worker among the running ones. The slot is held by a lock on
+    worker-<n>.lock for the life of the process, so a restarted worker takes over the slot of the
+    one it replaces and per-worker file names are reused instead of piling up.
+    """
+    global worker_slot_index
+    if worker_slot_index is None:
+        os.makedirs(LOCK_DIR, exist_ok=True)
+        index = 0
+        while True:
+            descriptor = os.open(os.path.join(LOCK_DIR, f"worker-{index}.lock"), os.O_CREAT | os.O_RDWR)
+            if try_lock(descriptor):
+                # Never closed: closing the descriptor would release the slot
+                break
+            os.close(descriptor)
+            index += 1
+        worker_slot_index = index
+    return worker_slot_index
@@ -34,6 +34,9 @@ vs_code_starter_agent = Agent(
 
         "OPENING FILES: Use the open_file tool with the exact file path. Confirm the file is opened in VS Code. "
         "GET SETTINGS: Use the get_settings tool to retrieve current VS Code user settings. "
+        "Only request the settings the user asked about: pass 'key' for a single setting (e.g. 'editor.fontSize'), "
+        "'prefix' for a group of settings (e.g. 'editor.' or 'python.'), or 'pointer' for nested values "
+        "(e.g. '/[python]/editor.tabSize'). Call it without arguments only when the user wants all settings. "
         # "FORMAT: 'File opened successfully in VS Code. Path: [exact file path]' "
 
         # "EDITING CODE: Use the edit_code tool to modify or append code in files. "
@@ -0,0 +1,158 @@
+"""
+Measure server throughput for different worker counts.
+
+Starts server.py once per worker count (JARVIS_WORKERS) and drives it from several
+client processes, so the load generator is not limited by one interpreter's GIL.
+
+Modes:
+  stub    (default) POST /api/chat with the agent replaced by benchmarks/stub_runner.py.
+          Requests go through session_lock, get_or_create_session and the shared
+          SQLite session store; every client thread keeps one session and sends
+          follow-up turns in it.
+  health  GET /api/health, i.e. bare HTTP overhead.
+  live    POST /api/chat against the real agent. Every turn calls Gemini, so the
+          free tier quota (15 requests/minute) caps the result, not the server.
+
+    python benchmarks/bench_workers.py --workers 1 2 4
+    python benchmarks/bench_workers.py --mode stub --stub-latency-ms 200 --stub-cpu-ms 20
+
+Recorded results (stub mode, 200 ms latency + 20 ms CPU per turn, 4x16 clients, 10 s):
+
+    1-CPU sandbox    workers 1: 25.5 req/s   2: 22.0 req/s   4: 16.8 req/s   (0 failures)
+
+On a single core extra workers only add contention, so these numbers do NOT show
+throughput scaling with worker count; no multi-core run has been recorded yet.
+Add a row here from a multi-core host before relying on --workers for throughput.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+from multiprocessing import Pool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wait_until_healthy(port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            connection.request("GET", "/api/health")
+            if connection.getresponse().status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def client_thread(port, mode, session_id, stop_at, results):
+    """Send requests back to back on one keep-alive connection until stop_at"""
+    completed, failed = 0, 0
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+    while time.time() < stop_at:
+        try:
+            if mode == "health":
+                connection.request("GET", "/api/health")
+            else:
+                body = json.dumps({"prompt": "What is in my Downloads folder?", "session_id": session_id})
+                connection.request("POST", "/api/chat", body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            text = response.read()
+            if response.status == 200 and b"Error" not in text:
+                completed += 1
+            else:
+                failed += 1
+        except (OSError, http.client.HTTPException):
+            failed += 1
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+    connection.close()
+    results.append((completed, failed))
+
+
+def client_process(job):
+    """One load-generating process running several client threads"""
+    index, port, mode, threads, stop_at = job
+    results = []
+    workers = [
+        threading.Thread(target=client_thread, args=(port, mode, f"bench-{index}-{thread}", stop_at, results))
+        for thread in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(result[0] for result in results), sum(result[1] for result in results)
+
+
+def run(workers, args, scratch):
+    env = dict(
+        os.environ,
+        JARVIS_WORKERS=str(workers),
+        JARVIS_PORT=str(args.port),
+        # Same shared store for every worker count so only the worker count differs
+        JARVIS_SESSION_DB_URL=f"sqlite+aiosqlite:///{os.path.join(scratch, f'sessions_{workers}.db')}",
+        JARVIS_LOCK_DIR=os.path.join(scratch, "locks"),
+        JARVIS_LOG_FILE=os.path.join(scratch, "jarvis.{worker}.log"),
+        JARVIS_LOG_LEVEL="WARNING",
+    )
+    if args.mode == "stub":
+        env.update(
+            JARVIS_STUB_AGENT="1",
+            JARVIS_STUB_LATENCY_MS=str(args.stub_latency_ms),
+            JARVIS_STUB_CPU_MS=str(args.stub_cpu_ms),
+        )
+    server = subprocess.Popen(
+        [sys.executable, "server.py"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_until_healthy(args.port):
+            raise RuntimeError(f"Server with {workers} workers did not become healthy")
+
+        stop_at = time.time() + args.duration
+        jobs = [(index, args.port, args.mode, args.threads, stop_at) for index in range(args.clients)]
+        with Pool(args.clients) as pool:
+            results = pool.map(client_process, jobs)
+        completed = sum(result[0] for result in results)
+        failed = sum(result[1] for result in results)
+        return completed / args.duration, failed
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--mode", choices=["stub", "health", "live"], default="stub")
+    parser.add_argument("--clients", type=int, default=4, help="Load-generating processes")
+    parser.add_argument("--threads", type=int, default=16, help="Connections (and sessions) per client process")
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--stub-latency-ms", type=float, default=200)
+    parser.add_argument("--stub-cpu-ms", type=float, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'req/s':>10} {'failed':>8} {'speedup':>8}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as scratch:
+        for workers in args.workers:
+            throughput, failed = run(workers, args, scratch)
+            baseline = baseline or throughput
+            print(f"{workers:>8} {throughput:>10.1f} {failed:>8} {(throughput / baseline if baseline else 0):>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
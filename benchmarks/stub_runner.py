@@ -0,0 +1,43 @@
+"""
+Stand-in for jarvis_runner used by bench_workers.py.
+
+Each turn loads the session, appends the user and model events to the session
+store, waits for a simulated model round trip and burns CPU for the event
+handling a real turn does. No Gemini requests are made, so worker scaling can be
+measured without hitting the API quota.
+
+    JARVIS_STUB_LATENCY_MS  simulated model latency per turn (default 200)
+    JARVIS_STUB_CPU_MS      CPU time spent per turn (default 20)
+"""
+
+import os
+import time
+import asyncio
+from google.adk.events import Event
+from google.genai.types import Content, Part
+
+
+class StubRunner:
+    def __init__(self, session_service, app_name="jarvis_app"):
+        self.session_service = session_service
+        self.app_name = app_name
+        self.latency = float(os.getenv("JARVIS_STUB_LATENCY_MS", "200")) / 1000
+        self.cpu = float(os.getenv("JARVIS_STUB_CPU_MS", "20")) / 1000
+
+    async def run_async(self, new_message, session_id, user_id):
+        session = await self.session_service.get_session(
+            app_name=self.app_name, user_id=user_id, session_id=session_id
+        )
+        await self.session_service.append_event(session, Event(author="user", content=new_message))
+
+        await asyncio.sleep(self.latency)
+        deadline = time.process_time() + self.cpu
+        while time.process_time() < deadline:
+            pass
+
+        reply = Event(
+            author="jarvis",
+            content=Content(role="model", parts=[Part(text=f"Turn {len(session.events)} done.")]),
+        )
+        await self.session_service.append_event(session, reply)
+        yield reply
@@ -4,11 +4,49 @@ load_dotenv()
 from fastapi import FastAPI, Request
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from agents.main_agent import jarvis_runner, session_service
-from google.genai.types import Content, Part
+from contextlib import asynccontextmanager
 import json
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+
+# The agent modules import each other as top-level modules (from log_config import ...);
+# import them the same way here so each one is loaded exactly once
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "agents"))
+
+from main_agent import jarvis_runner, session_service, close_toolsets, warm_catalog
+from session_lock import session_lock
+from log_config import get_logger, request_id_var
+from google.genai.types import Content, Part
+
+logger = get_logger("server")
+
+if os.getenv("JARVIS_STUB_AGENT") == "1":
+    # Benchmark mode: same session store and locking, no Gemini calls
+    from benchmarks.stub_runner import StubRunner
+
+    jarvis_runner = StubRunner(session_service)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # DatabaseSessionService creates its schema on first use; with several workers starting
+    # together that races, so let one worker at a time prepare it before serving requests.
+    if hasattr(session_service, "prepare_tables"):
+        async with session_lock("__session_store_schema__"):
+            await session_service.prepare_tables()
+    # Build the application catalog in the background so the first open request does not pay for the scan
+    warm_up = asyncio.create_task(warm_catalog())
+    yield
+    warm_up.cancel()
+    # Each worker spawned its own MCP tool servers; stop them with the worker
+    await close_toolsets()
+
 
-app = FastAPI(title="JARVIS UI Automation Agent")
+app = FastAPI(title="JARVIS UI Automation Agent", lifespan=lifespan)
 
 origins = [
     "http://localhost:8080",
@@ -20,6 +58,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Session-Id"],
 )
 
 async def get_or_create_session(app_name, session_id, user_id):
@@ -28,36 +67,62 @@ async def get_or_create_session(app_name, session_id, user_id):
         return await session_service.create_session(session_id=session_id, user_id=user_id, app_name=app_name)
     return session
 
-async def agent_response_generator(user_prompt: str, session_id: str, user_id: str):
+async def agent_response_generator(user_prompt: str, session_id: str, user_id: str, request_id: str):
     """
     Generator that streams agent responses to the client.
     Collects all text parts from the final model response.
     """
+    request_id_var.set(request_id)
     user_message = Content(
         role="user",
         parts=[Part(text=user_prompt)],
     )
     
-    await get_or_create_session("jarvis_app", session_id, user_id)
-    
     try:
         # Collect all events from the agent run
         all_events = []
         final_text_parts = []
-        
-        async for event in jarvis_runner.run_async(
-            new_message=user_message,
-            session_id=session_id,
-            user_id=user_id
-        ):
-            all_events.append(event)
-            
-            # Collect text parts from all model responses
-            if event.content and event.content.role == "model" and event.content.parts:
-                for part in event.content.parts:
-                    # Check for text content
-                    if hasattr(part, "text") and part.text:
-                        final_text_parts.append(part.text)
+        started = time.perf_counter()
+        last_event = started
+
+        # Only one run per session at a time, whichever worker the request landed on
+        async with session_lock(session_id):
+            await get_or_create_session("jarvis_app", session_id, user_id)
+
+            async for event in jarvis_runner.run_async(
+                new_message=user_message,
+                session_id=session_id,
+                user_id=user_id
+            ):
+                all_events.append(event)
+                now = time.perf_counter()
+                if logger.isEnabledFor(logging.DEBUG):
+                    event_type = "content"
+                    if event.get_function_calls():
+                        event_type = "function_call"
+                    elif event.get_function_responses():
+                        event_type = "function_response"
+                    logger.debug(
+                        "agent event",
+                        extra={
+                            "agent": event.author,
+                            "event_type": event_type,
+                            "duration_ms": round((now - last_event) * 1000, 1),
+                        },
+                    )
+                last_event = now
+
+                # Collect text parts from all model responses
+                if event.content and event.content.role == "model" and event.content.parts:
+                    for part in event.content.parts:
+                        # Check for text content
+                        if hasattr(part, "text") and part.text:
+                            final_text_parts.append(part.text)
+
+        logger.info(
+            f"Agent run finished with {len(all_events)} events",
+            extra={"event_type": "run_complete", "duration_ms": round((time.perf_counter() - started) * 1000, 1)},
+        )
         
         # Stream the collected responses
         if final_text_parts:
@@ -68,29 +133,23 @@ async def agent_response_generator(user_prompt: str, session_id: str, user_id: s
         else:
             # If no text parts found, stream debug info
             yield f"Agent completed but returned no text. Event count: {len(all_events)}\n\n"
-            yield "[DEBUG] Check server logs for full response structure.\n\n"
+            if logger.isEnabledFor(logging.DEBUG):
+                yield "[DEBUG] Check server logs for full response structure.\n\n"
             yield "[DONE]\n\n"
-            
-            # Log debug info to server console
-            print("\n[DEBUG] Response Analysis:")
-            for i, event in enumerate(all_events):
-                print(f"\nEvent {i}:")
-                print(f"  Author: {event.author}")
-                if event.content:
-                    print(f"  Role: {event.content.role}")
-                    if event.content.parts:
-                        for j, part in enumerate(event.content.parts):
-                            part_type = type(part).__name__
-                            print(f"  Part {j}: {part_type}")
-                            if hasattr(part, "text"):
-                                print(f"    Text: {part.text[:100] if part.text else 'None'}...")
-                            if hasattr(part, "tool_call"):
-                                print(f"    Tool call: {part.tool_call}")
+
+            logger.warning("Agent completed but returned no text", extra={"event_type": "empty_response"})
+            if logger.isEnabledFor(logging.DEBUG):
+                for event in all_events:
+                    parts = event.content.parts if event.content and event.content.parts else []
+                    logger.debug(
+                        f"role={event.content.role if event.content else None} "
+                        f"parts={[type(part).__name__ for part in parts]} "
+                        f"text={[part.text[:100] for part in parts if getattr(part, 'text', None)]}",
+                        extra={"agent": event.author, "event_type": "response_analysis"},
+                    )
     
     except Exception as e:
-        print(f"\n[ERROR] Exception during agent run: {str(e)}")
-        # import traceback
-        # traceback.print_exc()
+        logger.exception("Exception during agent run", extra={"event_type": "run_error"})
         yield f"Error during agent run: {str(e)}\n\n"
         yield "[DONE]\n\n"
 
@@ -104,6 +163,7 @@ async def chat_endpoint(request: Request):
     try:
         data = await request.json()
         user_prompt = data.get("prompt")
+        session_id = data.get("session_id")
     except json.JSONDecodeError:
         return StreamingResponse(
             iter(["data: Error: Invalid JSON in request\n\n", "data: [DONE]\n\n"]),
@@ -116,17 +176,22 @@ async def chat_endpoint(request: Request):
             media_type="text/event-stream"
         )
     
-    print(f"\n[INFO] Received prompt: {user_prompt[:100]}...")
+    request_id = uuid.uuid4().hex[:12]
+    logger.info(
+        f"Received prompt: {user_prompt[:100]}",
+        extra={"request_id": request_id, "event_type": "request"},
+    )
     
     # In production, these would come from authentication/login
-    # For now, generate unique session IDs per request
-    import uuid
-    session_id = f"session_{uuid.uuid4()}"
+    # Clients continue a conversation by sending back the X-Session-Id they received
+    if not session_id:
+        session_id = f"session_{uuid.uuid4()}"
     user_id = "default_user"
 
     return StreamingResponse(
-        agent_response_generator(user_prompt=user_prompt, session_id=session_id, user_id=user_id),
-        media_type="text/event-stream"
+        agent_response_generator(user_prompt=user_prompt, session_id=session_id, user_id=user_id, request_id=request_id),
+        media_type="text/event-stream",
+        headers={"X-Session-Id": session_id},
     )
 
 
@@ -141,12 +206,20 @@ async def health_check():
 if __name__ == "__main__":
     import uvicorn
 
+    workers = int(os.getenv("JARVIS_WORKERS", "1"))
+
     print("\n" + "="*50)
-    print("Starting JARVIS FastAPI Server")
+    print(f"Starting JARVIS FastAPI Server ({workers} worker{'s' if workers > 1 else ''})")
     print("="*50)
     print("Available endpoints:")
     print("  POST /api/chat - Send user prompt to agent")
     print("  GET  /api/health - Check server health")
     print("="*50 + "\n")
 
-    uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    if workers > 1:
+        # Workers are separate processes: sessions go to a shared SQLite store
+        # (inherited by the workers through the environment) and reload is unsupported.
+        os.environ.setdefault("JARVIS_SESSION_DB_URL", "sqlite+aiosqlite:///./jarvis_sessions.db")
+        uvicorn.run("server:app", host="0.0.0.0", port=int(os.getenv("JARVIS_PORT", "8000")), workers=workers)
+    else:
+        uvicorn.run("server:app", host="0.0.0.0", port=int(os.getenv("JARVIS_PORT", "8000")), reload=True)
\ No newline at end of file